@@ -20,6 +20,7 @@ from itertools import product
 import numpy as np
 
 import openfermion as of
+from openfermion.config import EQ_TOLERANCE
 import fqe
 from fqe.wavefunction import Wavefunction
 from fqe.hamiltonians.restricted_hamiltonian import RestrictedHamiltonian
@@ -44,24 +45,24 @@ def get_fermion_op(coeff_tensor) -> of.FermionOperator:
     Returns:
         A FermionOperator object
     """
+    # Terms are written straight into the operator's dictionary. Adding the
+    # terms one at a time would drop coefficients below EQ_TOLERANCE, so
+    # those are skipped here as well.
     if len(coeff_tensor.shape) == 4:
-        nso = coeff_tensor.shape[0]
         fermion_op = of.FermionOperator()
-        for p, q, r, s in product(range(nso), repeat=4):
+        for p, q, r, s in zip(*np.nonzero(
+                np.abs(coeff_tensor) >= EQ_TOLERANCE)):
             if p == q or r == s:
                 continue
-            op = ((p, 1), (q, 1), (r, 0), (s, 0))
-            fop = of.FermionOperator(op, coefficient=coeff_tensor[p, q, r, s])
-            fermion_op += fop
+            op = ((int(p), 1), (int(q), 1), (int(r), 0), (int(s), 0))
+            fermion_op.terms[op] = coeff_tensor[p, q, r, s]
         return fermion_op
 
     elif len(coeff_tensor.shape) == 2:
-        nso = coeff_tensor.shape[0]
         fermion_op = of.FermionOperator()
-        for p, q in product(range(nso), repeat=2):
-            oper = ((p, 1), (q, 0))
-            fop = of.FermionOperator(oper, coefficient=coeff_tensor[p, q])
-            fermion_op += fop
+        for p, q in zip(*np.nonzero(np.abs(coeff_tensor) >= EQ_TOLERANCE)):
+            oper = ((int(p), 1), (int(q), 0))
+            fermion_op.terms[oper] = coeff_tensor[p, q]
         return fermion_op
 
     else:
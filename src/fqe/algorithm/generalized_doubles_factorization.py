@@ -18,15 +18,31 @@ This will go into OpenFermion.  Putting here until I write something up
 or decide to just publish the code.
 """
 from typing import List, Tuple
-from itertools import product, groupby
 import numpy as np
 import scipy as sp
-from scipy.linalg import block_diag, sqrtm, polar, schur
+from scipy.linalg import eigh, svd, sqrtm, polar, schur
+from scipy.sparse.linalg import eigsh
 import openfermion as of
 from fqe.algorithm.brillouin_calculator import get_fermion_op
 
+try:
+    from joblib import Parallel, delayed
 
-def doubles_factorization_svd(generator_tensor: np.ndarray, eig_cutoff=None):
+    PARALLELIZABLE = True
+except ImportError:
+    PARALLELIZABLE = False
+
+_DEBUG = False
+"""Run the expensive consistency checks of the factorizations."""
+
+_EIGSH_MIN_DIM = 256
+"""Smallest generator matrix dimension for which a truncated real Takagi
+factorization uses Lanczos iteration instead of the dense eigh."""
+
+
+def doubles_factorization_svd(generator_tensor: np.ndarray,
+                              eig_cutoff=None,
+                              n_jobs: int = 1):
     """
     Given an antisymmetric antihermitian tensor perform a double factorized
     low-rank decomposition.
@@ -44,7 +60,13 @@ def doubles_factorization_svd(generator_tensor: np.ndarray, eig_cutoff=None):
     where Y_{l} are normal operator one-body operators such that the spectral
     theorem holds and we can use the double factorization to implement an
     approximate evolution.
+
+    The FermionOperators of the factors are built in pure Python. If
+    n_jobs is not 1 they are built in joblib worker processes instead.
     """
+    if n_jobs != 1 and not PARALLELIZABLE:
+        raise ImportError("Joblib is not available")
+
     if not np.allclose(generator_tensor.imag, 0):
         raise TypeError("generator_tensor must be a real matrix")
 
@@ -54,68 +76,91 @@ def doubles_factorization_svd(generator_tensor: np.ndarray, eig_cutoff=None):
 
     nso = generator_tensor.shape[0]
     generator_tensor = generator_tensor.real
-    generator_mat = np.zeros((nso**2, nso**2))
-    for row_gem, col_gem in product(range(nso**2), repeat=2):
-        p, s = row_gem // nso, row_gem % nso
-        q, r = col_gem // nso, col_gem % nso
-        generator_mat[row_gem, col_gem] = generator_tensor[p, q, r, s]
-    test_generator_mat = np.reshape(
-        np.transpose(generator_tensor, [0, 3, 1, 2]),
-        (nso**2, nso**2)).astype(np.float64)
-
-    assert np.allclose(test_generator_mat, generator_mat)
+    # generator_mat[p * nso + s, q * nso + r] = generator_tensor[p, q, r, s]
+    generator_mat = np.ascontiguousarray(np.transpose(generator_tensor,
+                                                      [0, 3, 1, 2]),
+                                         dtype=np.float64)
+    generator_mat = generator_mat.reshape(nso**2, nso**2)
 
     if not np.allclose(generator_mat, generator_mat.T):
         raise ValueError("generator tensor does not correspond to four-fold"
                          " antisymmetry")
 
-    one_body_residual = -np.einsum('pqrq->pr', generator_tensor)
-    u, sigma, vh = np.linalg.svd(generator_mat)
+    one_body_residual = -np.trace(generator_tensor, axis1=1, axis2=3)
+    # generator_mat is a local copy, so LAPACK may overwrite it. An
+    # eigendecomposition is not used here: the eigenvalues come in +/- pairs
+    # and eigh would give vl = +/-ul, so that either ul + vl or ul - vl
+    # vanishes for every factor.
+    u, sigma, vh = svd(generator_mat,
+                       full_matrices=False,
+                       lapack_driver='gesdd',
+                       check_finite=False,
+                       overwrite_a=True)
 
-    ul = []
-    ul_ops = []
-    vl = []
-    vl_ops = []
     if eig_cutoff is None:
         max_sigma = len(sigma)
     else:
         max_sigma = eig_cutoff
 
-    for ll in range(max_sigma):
-        ul.append(np.sqrt(sigma[ll]) * u[:, ll].reshape((nso, nso)))
-        ul_ops.append(
-            get_fermion_op(np.sqrt(sigma[ll]) * u[:, ll].reshape((nso, nso))))
-        vl.append(np.sqrt(sigma[ll]) * vh[ll, :].reshape((nso, nso)))
-        vl_ops.append(
-            get_fermion_op(np.sqrt(sigma[ll]) * vh[ll, :].reshape((nso, nso))))
-        S = ul_ops[ll] + vl_ops[ll]
-        D = ul_ops[ll] - vl_ops[ll]
-        op1 = S + 1j * of.hermitian_conjugated(S)
-        op2 = S - 1j * of.hermitian_conjugated(S)
-        op3 = D + 1j * of.hermitian_conjugated(D)
-        op4 = D - 1j * of.hermitian_conjugated(D)
-        assert np.isclose(
-            of.normal_ordered(of.commutator(
-                op1, of.hermitian_conjugated(op1))).induced_norm(), 0)
-        assert np.isclose(
-            of.normal_ordered(of.commutator(
-                op2, of.hermitian_conjugated(op2))).induced_norm(), 0)
-        assert np.isclose(
-            of.normal_ordered(of.commutator(
-                op3, of.hermitian_conjugated(op3))).induced_norm(), 0)
-        assert np.isclose(
-            of.normal_ordered(of.commutator(
-                op4, of.hermitian_conjugated(op4))).induced_norm(), 0)
-
-    one_body_op = of.FermionOperator()
-    for p, q in product(range(nso), repeat=2):
-        tfop = ((p, 1), (q, 0))
-        one_body_op += of.FermionOperator(tfop,
-                                          coefficient=one_body_residual[p, q])
+    # Scale and reshape all of the singular vectors at once
+    factor = np.sqrt(sigma[:max_sigma])[:, None, None]
+    ul = list(factor * u[:, :max_sigma].T.reshape(-1, nso, nso))
+    vl = list(factor * vh[:max_sigma, :].reshape(-1, nso, nso))
+    if n_jobs == 1:
+        ul_ops = [get_fermion_op(mat) for mat in ul]
+        vl_ops = [get_fermion_op(mat) for mat in vl]
+    else:
+        with Parallel(n_jobs=n_jobs) as parallel:
+            ops = parallel(delayed(get_fermion_op)(mat) for mat in ul + vl)
+        ul_ops, vl_ops = ops[:len(ul)], ops[len(ul):]
+
+    if _DEBUG:
+        # Y_l are normal operators by construction; verifying it builds
+        # several commutators of FermionOperators per factor
+        for ll in range(len(ul)):
+            S = ul_ops[ll] + vl_ops[ll]
+            D = ul_ops[ll] - vl_ops[ll]
+            op1 = S + 1j * of.hermitian_conjugated(S)
+            op2 = S - 1j * of.hermitian_conjugated(S)
+            op3 = D + 1j * of.hermitian_conjugated(D)
+            op4 = D - 1j * of.hermitian_conjugated(D)
+            for op in (op1, op2, op3, op4):
+                comm = of.commutator(op, of.hermitian_conjugated(op))
+                assert np.isclose(of.normal_ordered(comm).induced_norm(), 0)
+
+    one_body_op = get_fermion_op(one_body_residual)
 
     return ul, vl, one_body_residual, ul_ops, vl_ops, one_body_op
 
 
+def _sqrtm_unitary(mats: np.ndarray, cond_max: float = 1.0e8) -> np.ndarray:
+    """Principal square roots of a stack of unitary matrices.
+
+    A unitary matrix is diagonalizable, M = V diag(w) V^-1, so its square
+    root is V diag(sqrt(w)) V^-1. This avoids the Schur-based sqrtm for every
+    matrix and is batched over the leading axis. Matrices whose eigenvectors
+    are too ill-conditioned to invert fall back to scipy.linalg.sqrtm.
+
+    Args:
+        mats (np.ndarray): stack of unitary matrices with shape (k, d, d)
+
+        cond_max (float): largest condition number of the eigenvector \
+            matrix accepted before falling back to sqrtm
+
+    Returns:
+        np.ndarray: stack of square roots with shape (k, d, d)
+    """
+    w, vecs = np.linalg.eig(mats)
+    stable = np.linalg.cond(vecs) < cond_max
+    roots = np.empty(mats.shape, dtype=np.complex128)
+    if np.any(stable):
+        roots[stable] = (vecs[stable] * np.sqrt(w[stable])[:, None, :]) \
+                        @ np.linalg.inv(vecs[stable])
+    for k in np.where(~stable)[0]:
+        roots[k] = sqrtm(mats[k])
+    return roots
+
+
 def takagi(N, tol=1e-13, rounding=13):
     r"""Autonne-Takagi decomposition of a complex symmetric (not Hermitian!) matrix.
 
@@ -145,52 +190,78 @@ def takagi(N, tol=1e-13, rounding=13):
         return np.zeros(n), np.eye(n)
 
     if np.isrealobj(N):
-        # If the matrix N is real one can be more clever and use its eigendecomposition
-        l, U = np.linalg.eigh(N)
-        vals = np.abs(l)  # These are the Takagi eigenvalues
-        phases = np.sqrt(np.complex128([1 if i > 0 else -1 for i in l]))
-        Uc = U @ np.diag(phases)  # One needs to readjust the phases
-        list_vals = [(vals[i], i) for i in range(len(vals))]
-        list_vals.sort(reverse=True)
-        sorted_l, permutation = zip(*list_vals)
-        permutation = np.array(permutation)
-        Uc = Uc[:, permutation]
-        # And also rearrange the unitary and values so that they are decreasingly ordered
-        return np.array(sorted_l), Uc
+        return takagi_real(N)
 
     v, l, ws = np.linalg.svd(N)
     w = np.transpose(np.conjugate(ws))
     rl = np.round(l, rounding)
 
-    # Generate list with degenerancies
-    result = []
-    for k, g in groupby(rl):
-        result.append(list(g))
-
-    # Generate lists containing the columns that correspond to degenerancies
-    kk = 0
-    for k in result:
-        for ind, j in enumerate(k):  # pylint: disable=unused-variable
-            k[ind] = kk
-            kk = kk + 1
+    # Generate the lists of columns that correspond to degenerancies
+    _, labels = np.unique(rl, return_inverse=True)
+    order = np.argsort(labels, kind='stable')
+    result = np.split(order, np.cumsum(np.bincount(labels))[:-1])
 
     # Generate the lists with the degenerate column subspaces
-    vas = []
-    was = []
-    for i in result:
-        vas.append(v[:, i])
-        was.append(w[:, i])
+    vas = [v[:, cols] for cols in result]
+    was = [w[:, cols] for cols in result]
+
+    # Generate the matrices qs of the degenerate subspaces. Subspaces of the
+    # same dimension are stacked so that their square roots are batched
+    qs = [None] * len(result)
+    groups_by_size = {}
+    for i, cols in enumerate(result):
+        groups_by_size.setdefault(len(cols), []).append(i)
+    for group in groups_by_size.values():
+        mats = np.stack([np.transpose(vas[i]) @ was[i] for i in group])
+        for i, qmat in zip(group, _sqrtm_unitary(mats)):
+            qs[i] = qmat
+
+    # Construct the Takagi unitary block by block, U = v @ conj(block_diag(qs)).
+    # Non-degenerate values give 1x1 blocks, i.e. a plain column scaling
+    U = np.empty_like(v, dtype=np.complex128)
+    diag_cols = []
+    diag_vals = []
+    for cols, qmat in zip(result, qs):
+        if len(cols) == 1:
+            diag_cols.append(cols[0])
+            diag_vals.append(qmat[0, 0])
+        else:
+            U[:, cols] = v[:, cols] @ np.conj(qmat)
+    U[:, diag_cols] = v[:, diag_cols] * np.conj(diag_vals)[None, :]
+    return rl, U
 
-    # Generate the matrices qs of the degenerate subspaces
-    qs = []
-    for i in range(len(result)):
-        qs.append(sqrtm(np.transpose(vas[i]) @ was[i]))
 
-    # Construct the Takagi unitary
-    qb = block_diag(*qs)
+def takagi_real(N):
+    r"""Autonne-Takagi decomposition of a real symmetric matrix.
 
-    U = v @ np.conj(qb)
-    return rl, U
+    For a real matrix the decomposition follows directly from the
+    eigendecomposition, N = U diag(l) U^T, by absorbing the signs of the
+    eigenvalues into the phases of the columns of U. No input checks are
+    performed; see takagi for the general complex case.
+
+    Args:
+        N (array[float]): square, real symmetric matrix N
+
+    Returns:
+        tuple[array, array]: (vals, U), where vals are the Takagi values in \
+            decreasing order and U is the Takagi unitary, such that \
+            :math:`N = U \mathrm{diag}(vals) U^T`.
+    """
+    l, U = eigh(N, driver='evr', check_finite=False)
+    return _takagi_from_eigh(l, U)
+
+
+def _takagi_from_eigh(l, U):
+    """Takagi values and vectors from the (possibly partial)
+    eigendecomposition N U = U diag(l) of a real symmetric matrix.
+    """
+    vals = np.abs(l)  # These are the Takagi eigenvalues
+    # sqrt(sign(l)): 1 for non-negative and 1j for negative eigenvalues
+    phases = np.where(l >= 0, 1.0 + 0.0j, 1.0j)
+    Uc = U * phases[None, :]  # One needs to readjust the phases
+    # And also rearrange the unitary and values so that they are decreasingly ordered
+    permutation = np.argsort(-vals, kind='stable')
+    return vals[permutation], Uc[:, permutation]
 
 
 def doubles_factorization_takagi(generator_tensor: np.ndarray, eig_cutoff=None):
@@ -214,33 +285,71 @@ def doubles_factorization_takagi(generator_tensor: np.ndarray, eig_cutoff=None):
     theorem holds and we can use the double factorization to implement an
     approximate evolution.
     """
+    nso, generator_mat, one_body_residual = _takagi_generator_mat(
+        generator_tensor, eig_cutoff)
+
+    # complex symmetric matrices give Q S Q^T with S diagonal and real
+    # and Q is unitary. Real generators only need the eigendecomposition
+    if np.iscomplexobj(generator_mat):
+        T, Z = takagi(generator_mat)
+    elif eig_cutoff and nso**2 >= _EIGSH_MIN_DIM and \
+            eig_cutoff <= nso**2 // 8:
+        # Only the eig_cutoff largest Takagi values are kept, and for large
+        # generators computing just those is cheaper than the full eigh
+        l, U = eigsh(generator_mat, k=eig_cutoff, which='LM')
+        T, Z = _takagi_from_eigh(l, U)
+    else:
+        T, Z = takagi_real(generator_mat)
+
+    Zlp, Zlm, Zl = _takagi_factors(T, Z, nso, eig_cutoff)
+    return Zlp, Zlm, Zl, one_body_residual
+
+
+def _takagi_generator_mat(generator_tensor, eig_cutoff):
+    """Checks the arguments of the Takagi factorization and returns the
+    number of spin orbitals, the generator as a (nso**2, nso**2) matrix and
+    the one-body residual. The matrix is real if the imaginary part of the
+    generator is within rounding noise, as judged by np.real_if_close.
+    """
     if eig_cutoff is not None:
         if eig_cutoff % 2 != 0:
             raise ValueError("eig_cutoff must be an even number")
 
     nso = generator_tensor.shape[0]
-    generator_mat = np.reshape(np.transpose(generator_tensor, [0, 3, 1, 2]),
-                               (nso**2, nso**2))
-    assert np.allclose(generator_mat, generator_mat.T)
+    generator_mat = np.ascontiguousarray(
+        np.transpose(generator_tensor, [0, 3, 1, 2])).reshape(nso**2, nso**2)
+    # eigh reads only one triangle, so an asymmetric generator would give a
+    # wrong factorization without an error
+    if not np.allclose(generator_mat, generator_mat.T):
+        raise ValueError("generator tensor does not correspond to four-fold"
+                         " antisymmetry")
 
-    one_body_residual = -np.einsum('pqrq->pr', generator_tensor)
+    one_body_residual = -np.trace(generator_tensor, axis1=1, axis2=3)
+
+    # small but genuine imaginary parts, e.g. of a nearly converged residual,
+    # must not be dropped, so only rounding noise counts as real
+    generator_mat = np.ascontiguousarray(np.real_if_close(generator_mat))
+    return nso, generator_mat, one_body_residual
 
-    # complex symmetric matrices give Q S Q^T with S diagonal and real
-    # and Q is unitary.
-    T, Z = takagi(generator_mat)
 
+def _takagi_factors(T, Z, nso, eig_cutoff):
+    """Builds the factors Zl and the normal operators Zl +/- i Zl^dagger from
+    the Takagi values T and vectors Z of the generator matrix.
+    """
     nonzero_idx = np.where(T > 1.0E-12)[0]
     if eig_cutoff is None:
         max_sigma = len(nonzero_idx)
     else:
         max_sigma = eig_cutoff
 
-    Zl = []
-    Zlp = []
-    Zlm = []
-    for idx in nonzero_idx[:max_sigma]:
-        Zl.append(np.sqrt(T[idx]) * Z[:, idx].reshape((nso, nso)))
-        Zlp.append(Zl[-1] + 1j * Zl[-1].conj().T)
-        Zlm.append(Zl[-1] - 1j * Zl[-1].conj().T)
-
-    return Zlp, Zlm, Zl, one_body_residual
+    # Gather the selected columns of Z into one contiguous block and build
+    # all of the factors at once as a stack of (nso, nso) matrices
+    sel = nonzero_idx[:max_sigma]
+    Zsel = np.ascontiguousarray(Z[:, sel].T).reshape(len(sel), nso, nso)
+    Zl = np.sqrt(T[sel])[:, None, None] * Zsel
+    # Zlp and Zlm share the same adjoint term, so it is formed only once
+    Zl_adj = 1j * Zl.conj().transpose(0, 2, 1)
+    Zlp = Zl + Zl_adj
+    Zlm = Zl - Zl_adj
+
+    return list(Zlp), list(Zlm), list(Zl)
@@ -130,17 +130,15 @@ class FqeData:
                    self._core.index_beta(key[1])] = value
 
     def __deepcopy__(self, memodict={}) -> 'FqeData':
-        """Construct new FqeData that has the same coefficient
+        """Construct new FqeData that has the same coefficient. The FciGraph
+        is shared, and only the coefficients are copied.
 
         Returns:
             FqeData: an object that is deepcopied from self
         """
-        new_data = FqeData(nalpha=self.nalpha(),
-                           nbeta=self.nbeta(),
-                           norb=self._core.norb(),
-                           fcigraph=self._core,
-                           dtype=self._dtype)
-        new_data._low_thresh = self._low_thresh
+        # bypass __init__ so that no zero coefficient array is allocated
+        new_data = self.__class__.__new__(self.__class__)
+        new_data.__dict__.update(self.__dict__)
         new_data.coeff = self.coeff.copy()
         return new_data
 
@@ -13,9 +13,10 @@
 #   limitations under the License.
 """Defines the GSOHamiltonain (Generalized Spin Orbital Hamiltonian) object."""
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import numpy
+from scipy.linalg import eigh
 
 from fqe.hamiltonians import hamiltonian
 from fqe.util import tensors_equal
@@ -66,6 +67,9 @@ class GSOHamiltonian(hamiltonian.Hamiltonian):
 
         self._dim = list(self._tensor.values())[0].shape[0]
 
+        # The diagonalizing transformation is computed on first use
+        self._diag_trans: Optional[numpy.ndarray] = None
+
     def __eq__(self, other: object) -> bool:
         """ Comparison operator
         Args:
@@ -80,20 +84,32 @@ class GSOHamiltonian(hamiltonian.Hamiltonian):
             return self.e_0() == other.e_0() \
                 and tensors_equal(self._tensor, other._tensor)
 
-    def iht(self, time: float) -> Tuple[numpy.ndarray, ...]:
+    def iht(
+            self,
+            time: float,
+            out: Optional[Tuple[numpy.ndarray, ...]] = None,
+    ) -> Tuple[numpy.ndarray, ...]:
         """Returns the matrices of the Hamiltonian prepared for time evolution.
 
         Args:
             time (float): time associated with the time propagation
 
+            out (Tuple[numpy.ndarray, ...]): optional complex buffers, one per \
+                tensor, into which the result is written. This allows \
+                repeated time steps to reuse the same storage.
+
         Returns:
             Tuple[numpy.ndarray, ...]: tuple of arrays to be used in time propagation
         """
-        iht_mat = []
-        for rank in range(len(self._tensor)):
-            iht_mat.append(-1.0j * time * self._tensor[2 * (rank + 1)])
-
-        return tuple(iht_mat)
+        factor = -1.0j * time
+        if out is None:
+            return tuple(factor * tensor for tensor in self.tensors())
+
+        if len(out) != len(self._tensor):
+            raise ValueError("out must contain one array per tensor")
+        for tensor, buf in zip(self.tensors(), out):
+            numpy.multiply(tensor, factor, out=buf)
+        return tuple(out)
 
     def dim(self) -> int:
         """
@@ -139,13 +155,22 @@ class GSOHamiltonian(hamiltonian.Hamiltonian):
 
     def calc_diag_transform(self) -> numpy.ndarray:
         """Performs a unitary digaonlizing transformation of the one body term
-        and returns that transformation.
+        and returns that transformation. The result is cached since the
+        Hamiltonian does not change after construction.
 
         Returns:
-            numpy.ndarray: unitary transformation matrix
+            numpy.ndarray: unitary transformation matrix. The cached array is \
+                read-only and shared between calls.
         """
-        _, trans = numpy.linalg.eigh(self._tensor[2])
-        return trans
+        # objects restored from older pickles may lack the cache attribute
+        diag_trans = getattr(self, '_diag_trans', None)
+        if diag_trans is None:
+            _, diag_trans = eigh(self._tensor[2],
+                                 driver='evr',
+                                 check_finite=False)
+            diag_trans.setflags(write=False)
+            self._diag_trans = diag_trans
+        return diag_trans
 
     def transform(self, trans: numpy.ndarray) -> numpy.ndarray:
         """Tranforms the one body term using the provided matrix.
@@ -86,10 +86,9 @@ def get_tpdm_grad(wf, acse_res, nso):
 def get_particle_projected(wf, n_target):
     """Testing Utility"""
     dim = int(np.log2(wf.shape[0]))
-    for ii in range(2**dim):
-        ket = [int(x) for x in np.binary_repr(ii, width=dim)]
-        if sum(ket) != n_target:
-            wf[ii, 0] = 0
+    index = np.arange(2**dim)
+    nparticle = ((index[:, None] >> np.arange(dim)) & 1).sum(axis=1)
+    wf[nparticle != n_target, 0] = 0
     wf /= np.linalg.norm(wf)
     return wf
 
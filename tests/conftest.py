@@ -12,8 +12,13 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import os
+
+import pytest
+
 import fqe.settings
 from fqe.settings import CodePath
+from tests.unittest_data.fqe_data_loader import FqeDataLoader
 
 
 def pytest_addoption(parser):
@@ -26,6 +31,17 @@ def pytest_addoption(parser):
                      help="Run Python tests only")
 
 
+def pytest_configure(config):
+    """
+    Register the markers used for selecting code paths
+    """
+    config.addinivalue_line(
+        "markers", "python_fallback: run of a test on the Python code path")
+    config.addinivalue_line(
+        "markers", "slow: expensive test whose Python code path is skipped "
+        "when the environment variable FQE_FAST_TESTS is set")
+
+
 def pytest_generate_tests(metafunc):
     """
     Parametrize tests for C or Python depending on available code paths and
@@ -44,7 +60,41 @@ def pytest_generate_tests(metafunc):
             test_code_paths.remove(CodePath.PYTHON)
         if metafunc.config.getoption("--python-only"):
             test_code_paths.remove(CodePath.C)
-        metafunc.parametrize("c_or_python", test_code_paths)
+
+        # The Python code path is marked so that it can be deselected with
+        # -m "not python_fallback". For slow tests it is skipped altogether
+        # when FQE_FAST_TESTS is set.
+        skip_python = os.environ.get("FQE_FAST_TESTS") and \
+            metafunc.definition.get_closest_marker("slow") is not None
+        params = []
+        for code_path in test_code_paths:
+            if code_path == CodePath.PYTHON:
+                marks = [pytest.mark.python_fallback]
+                if skip_python:
+                    marks.append(
+                        pytest.mark.skip(reason="FQE_FAST_TESTS is set"))
+                params.append(pytest.param(code_path, marks=marks))
+            else:
+                params.append(code_path)
+        metafunc.parametrize("c_or_python", params)
 
     if "alpha_or_beta" in metafunc.fixturenames:
         metafunc.parametrize("alpha_or_beta", ["alpha", "beta"])
+
+
+@pytest.fixture(scope="session")
+def loader_2_3_6():
+    """
+    Reference data for 2 alpha and 3 beta electrons in 6 orbitals, shared
+    by all tests in the session
+    """
+    return FqeDataLoader(2, 3, 6)
+
+
+@pytest.fixture(scope="session")
+def loader_2_1_4():
+    """
+    Reference data for 2 alpha and 1 beta electrons in 4 orbitals, shared
+    by all tests in the session
+    """
+    return FqeDataLoader(2, 1, 4)
@@ -60,9 +60,7 @@ def test_diagonal_evolution():
     lenb = int(special.binom(norb, nbeta))
     cidim = lena * lenb
 
-    h1e = numpy.zeros((norb, norb), dtype=numpy.complex128)
-    for i in range(norb):
-        h1e[i, i] += (i + 1) * 2.0
+    h1e = numpy.diag((numpy.arange(norb) + 1) * 2.0).astype(numpy.complex128)
 
     h_wrap = tuple([h1e])
     # === Reference Wavefunction ===
@@ -121,11 +119,9 @@ def test_quadratic_both_conserved(c_or_python):
     """
     fqe.settings.use_accelerated_code = c_or_python
     norb = 4
-    h1e = numpy.zeros((norb, norb), dtype=numpy.complex128)
-    for i in range(norb):
-        for j in range(norb):
-            h1e[i, j] += (i + j) * 0.02
-        h1e[i, i] += i * 2.0
+    idx = numpy.arange(norb)
+    h1e = ((idx[:, None] + idx[None, :]) * 0.02 + numpy.diag(idx * 2.0)).astype(
+        numpy.complex128)
 
     hamil = fqe.get_restricted_hamiltonian((h1e,))
 
@@ -169,13 +165,10 @@ def test_quadratic_number_conserved_spin_broken():
 
     h1e = numpy.zeros((2 * norb, 2 * norb), dtype=numpy.complex128)
 
-    mata = numpy.zeros((norb, norb), dtype=numpy.complex128)
-    matb = numpy.zeros((norb, norb), dtype=numpy.complex128)
-    for i in range(norb):
-        for j in range(norb):
-            mata[i, j] += (i + j) * 0.02
-            matb[i, j] += (i - j) * 0.002
-        mata[i, i] += i * 2.0
+    idx = numpy.arange(norb)
+    mata = ((idx[:, None] + idx[None, :]) * 0.02 +
+            numpy.diag(idx * 2.0)).astype(numpy.complex128)
+    matb = ((idx[:, None] - idx[None, :]) * 0.002).astype(numpy.complex128)
     h1e[:norb, :norb] = mata
     h1e[norb:, norb:] = mata.conj()
     h1e[:norb, norb:] = matb
@@ -333,10 +326,8 @@ def test_diagonal_spin(c_or_python):
 
     h1e = numpy.zeros((2 * norb, 2 * norb), dtype=numpy.complex128)
 
-    for i in range(2 * norb):
-        for j in range(2 * norb):
-            h1e[i, j] += (i + j) * 0.02
-        h1e[i, i] += i * 2.0
+    idx = numpy.arange(2 * norb)
+    h1e += (idx[:, None] + idx[None, :]) * 0.02 + numpy.diag(idx * 2.0)
     h1e[:norb, norb:] = 0.0
     h1e[norb:, :norb] = 0.0
 
@@ -785,10 +776,8 @@ def test_chebyshev():
 
     h1e = numpy.zeros((norb * 2, norb * 2), dtype=numpy.complex128)
 
-    for i in range(2 * norb):
-        for j in range(2 * norb):
-            h1e[i, j] += (i + j) * 0.02
-        h1e[i, i] += i * 2.0
+    idx = numpy.arange(2 * norb)
+    h1e += (idx[:, None] + idx[None, :]) * 0.02 + numpy.diag(idx * 2.0)
 
     eig, _ = linalg.eigh(h1e)
     hamil = fqe.get_general_hamiltonian((h1e,))
@@ -10,11 +10,13 @@
 #   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
+from functools import partial
 from itertools import product
 import copy
 
 import numpy as np
 import scipy as sp
+import pytest
 
 import openfermion as of
 from openfermion.chem.molecular_data import spinorb_from_spatial
@@ -22,7 +24,8 @@ from openfermion.chem import make_reduced_hamiltonian
 
 import fqe
 from fqe.algorithm.generalized_doubles_factorization import (
-    doubles_factorization_svd, doubles_factorization_takagi, takagi)
+    doubles_factorization_svd, doubles_factorization_takagi, takagi,
+    takagi_real, _sqrtm_unitary, PARALLELIZABLE)
 from fqe.algorithm.brillouin_calculator import two_rdo_commutator_symm
 from fqe.algorithm.brillouin_calculator import get_fermion_op
 from fqe.algorithm.low_rank import (
@@ -454,3 +457,102 @@ def test_takagi():
     assert np.allclose(C, C.T)
     T, Z = takagi(C)
     assert np.allclose(Z @ np.diag(T) @ Z.T, C)
+
+
+def test_takagi_real():
+    A = np.random.randn(36).reshape((6, 6))
+    A = A + A.T
+    T, Z = takagi_real(A)
+    assert np.allclose(Z @ np.diag(T) @ Z.T, A)
+    assert np.allclose(Z.conj().T @ Z, np.eye(6))
+    assert np.all(np.diff(T) <= 0)
+    Tref, _ = takagi(A)
+    assert np.allclose(T, Tref)
+
+
+def test_takagi_degenerate(monkeypatch):
+    np.random.seed(3)
+    Q, _ = np.linalg.qr(np.random.randn(5, 5) + 1j * np.random.randn(5, 5))
+    N = Q @ np.diag([1.0, 1.0, 2.0, 2.0, 3.0]) @ Q.T
+
+    def check():
+        T, U = takagi(N)
+        assert np.allclose(T, [3.0, 2.0, 2.0, 1.0, 1.0])
+        assert np.allclose(U.conj().T @ U, np.eye(5))
+        assert np.allclose(U @ np.diag(T) @ U.T, N)
+
+    check()
+    # no condition number is below zero, so every degenerate subspace goes
+    # through the sqrtm fallback
+    monkeypatch.setattr(
+        'fqe.algorithm.generalized_doubles_factorization._sqrtm_unitary',
+        partial(_sqrtm_unitary, cond_max=0.0))
+    check()
+
+
+def test_factorization_debug_checks(monkeypatch):
+    monkeypatch.setattr(
+        'fqe.algorithm.generalized_doubles_factorization._DEBUG', True)
+    generator = generate_antisymm_generator(4)
+    ul, vl, _, _, _, _ = doubles_factorization_svd(generator)
+    assert len(ul) == len(vl) == 16
+    Zlp, Zlm, _, _ = doubles_factorization_takagi(generator)
+    assert len(Zlp) == len(Zlm)
+
+
+def test_doubles_factorization_asymmetric():
+    np.random.seed(5)
+    generator = np.random.randn(4, 4, 4, 4)
+    with pytest.raises(ValueError):
+        doubles_factorization_svd(generator)
+    with pytest.raises(ValueError):
+        doubles_factorization_takagi(generator)
+
+
+def test_doubles_factorization_takagi_small_imaginary():
+    np.random.seed(7)
+    nso = 4
+    generator = 1.0e-6 * generate_antisymm_generator(nso) + \
+        1.0e-9j * generate_antisymm_generator(nso)
+    _, _, Zl, _ = doubles_factorization_takagi(generator)
+    generator_mat = np.transpose(generator,
+                                 [0, 3, 1, 2]).reshape(nso**2, nso**2)
+    test_mat = sum(np.outer(zz.flatten(), zz.flatten()) for zz in Zl)
+    assert np.allclose(test_mat, generator_mat, rtol=0.0, atol=1.0e-12)
+
+
+def test_doubles_factorization_svd_parallel():
+    generator = generate_antisymm_generator(4)
+    if PARALLELIZABLE:
+        _, _, _, ul_ops, vl_ops, _ = doubles_factorization_svd(generator)
+        _, _, _, ul_ops_par, vl_ops_par, _ = \
+            doubles_factorization_svd(generator, n_jobs=2)
+        assert ul_ops == ul_ops_par
+        assert vl_ops == vl_ops_par
+    else:
+        with pytest.raises(ImportError):
+            doubles_factorization_svd(generator, n_jobs=2)
+
+
+def test_doubles_factorization_takagi_truncated(monkeypatch):
+    np.random.seed(11)
+    generator = generate_antisymm_generator(4)
+    nso = generator.shape[0]
+    eig_cutoff = 2
+
+    def truncated(Zl):
+        mat = np.zeros((nso**2, nso**2), dtype=np.complex128)
+        for zz in Zl:
+            mat += np.outer(zz.flatten(), zz.flatten())
+        return mat
+
+    _, _, Zl_ref, one_body_ref = \
+        doubles_factorization_takagi(generator, eig_cutoff=eig_cutoff)
+    # use Lanczos iteration even for this small generator
+    monkeypatch.setattr(
+        'fqe.algorithm.generalized_doubles_factorization._EIGSH_MIN_DIM', 0)
+    _, _, Zl, one_body_residual = \
+        doubles_factorization_takagi(generator, eig_cutoff=eig_cutoff)
+    assert np.allclose(one_body_residual, one_body_ref)
+    assert len(Zl) == eig_cutoff
+    assert np.allclose(truncated(Zl), truncated(Zl_ref))
@@ -37,6 +37,8 @@ def test_gso():
     assert test.quadratic()
 
     trans = test.calc_diag_transform()
+    assert test.calc_diag_transform() is trans
+    assert not trans.flags.writeable
     diag = trans.conj().T @ h1e @ trans
     diag2 = test.transform(trans)
     assert numpy.allclose(diag, diag2)
@@ -47,6 +49,13 @@ def test_gso():
     iht = test.iht(time)
     assert numpy.allclose(iht, h1e * (-1j * time))
 
+    buf = (numpy.empty_like(h1e),)
+    iht_out = test.iht(time, out=buf)
+    assert iht_out[0] is buf[0]
+    assert numpy.allclose(iht_out, h1e * (-1j * time))
+    with pytest.raises(ValueError):
+        test.iht(time, out=(buf[0], buf[0]))
+
     h2e = numpy.random.rand(norb, norb, norb, norb).astype(numpy.complex128)
     test2 = gso_hamiltonian.GSOHamiltonian((h1e, h2e))
     assert not test2.quadratic()
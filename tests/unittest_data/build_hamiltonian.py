@@ -17,7 +17,8 @@
 # pylint: disable=missing-docstring
 # pylint: disable=invalid-name
 # pylint: disable=too-many-nested-blocks
-from typing import Tuple
+from functools import lru_cache
+from typing import Optional, Tuple
 
 import numpy as np
 
@@ -79,16 +80,14 @@ def to_spin1(h1r: np.ndarray, asymmetric: bool = False) -> np.ndarray:
     """
     norb = h1r.shape[0]
     assert (h1r.shape[1] == norb)
-    n = 2 * norb
-    h1e = np.zeros((n, n))
 
-    h1e[:norb, :norb] = h1r
     prefactor = 2.0 if asymmetric else 1.0
-    h1e[norb:, norb:] = prefactor * h1r
-    return h1e
+    return np.kron(np.diag([1.0, prefactor]), h1r)
 
 
-def to_spin2(h2r: np.ndarray, asymmetric: bool = False) -> np.ndarray:
+def to_spin2(h2r: np.ndarray,
+             asymmetric: bool = False,
+             spin: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Converts the 2-body Hamiltonian term from spatial to spin-orbital basis
 
@@ -98,6 +97,10 @@ def to_spin2(h2r: np.ndarray, asymmetric: bool = False) -> np.ndarray:
         asymmetric (bool): introduce asymmetry between alpha and beta terms, \
             has no effect if full=False
 
+        spin (np.ndarray): optional (2, 2, 2, 2) weights of the spin blocks \
+            (s1, s2, s3, s4). If given, it replaces the spin-conserving \
+            weights and asymmetric is ignored
+
     Returns:
         (np.ndarray): resulting array
     """
@@ -106,17 +109,21 @@ def to_spin2(h2r: np.ndarray, asymmetric: bool = False) -> np.ndarray:
     assert (h2r.shape[2] == norb)
     assert (h2r.shape[3] == norb)
     n = 2 * norb
-    h2e = np.zeros((n, n, n, n))
-    h2e[:norb, :norb, :norb, :norb] = h2r
 
-    prefactor = 2.0 if asymmetric else 1.0
-    h2e[:norb, norb:, :norb, norb:] = prefactor * h2r
-    h2e[norb:, :norb, norb:, :norb] = prefactor * h2r
+    if spin is None:
+        # weights of the spin blocks (s1, s2, s1, s2) of the spin-orbital
+        # array
+        spin = np.zeros((2, 2, 2, 2))
+        spin[0, 0, 0, 0] = 1.0
 
-    prefactor = 4.0 if asymmetric else 1.0
-    h2e[norb:, norb:, norb:, norb:] = prefactor * h2r
+        prefactor = 2.0 if asymmetric else 1.0
+        spin[0, 1, 0, 1] = prefactor
+        spin[1, 0, 1, 0] = prefactor
 
-    return h2e
+        prefactor = 4.0 if asymmetric else 1.0
+        spin[1, 1, 1, 1] = prefactor
+
+    return np.einsum('abcd,ijkl->aibjckdl', spin, h2r).reshape((n, n, n, n))
 
 
 def to_spin3(h3r: np.ndarray, asymmetric: bool = False) -> np.ndarray:
@@ -286,9 +293,12 @@ def build_H2(norb: int, full: bool = False, asymmetric: bool = False) \
         return h2e
 
 
+@lru_cache(maxsize=8)
 def build_H3(norb: int, full: bool = False, asymmetric: bool = False) \
     -> np.ndarray:
-    """Build Hamiltonian array for 3-body interactions.
+    """Build Hamiltonian array for 3-body interactions. The result is cached \
+    and the same array is returned to every caller with the same arguments, \
+    so it is read-only. Callers that need to modify it must take a copy.
 
     Args:
         norb (int): number of orbitals
@@ -299,7 +309,7 @@ def build_H3(norb: int, full: bool = False, asymmetric: bool = False) \
             has no effect if full=False
 
     Returns:
-        (np.ndarray): resulting array
+        (np.ndarray): resulting read-only array, shared between calls
     """
 
     h3e = np.zeros((norb,) * 6)
@@ -314,9 +324,9 @@ def build_H3(norb: int, full: bool = False, asymmetric: bool = False) \
                                                       (k + n) * 0.002)
 
     if full:
-        return to_spin3(h3e, asymmetric)
-    else:
-        return h3e
+        h3e = to_spin3(h3e, asymmetric)
+    h3e.setflags(write=False)
+    return h3e
 
 
 def build_H4(norb: int, full: bool = False, asymmetric: bool = False) \
@@ -32,6 +32,15 @@ class FqeDataLoader:
         ci = numpy.fromfile(fi).reshape(self.data.coeff.shape)
         self.data.coeff = cr + 1.j * ci
 
+        # reference arrays are loaded once per loader and shared read-only
+        self._cache = {}
+
+    def _store(self, key, array):
+        """Mark array read-only, cache it under key and return it"""
+        array.setflags(write=False)
+        self._cache[key] = array
+        return array
+
     def get_fqe_data(self):
         """Return a copy of the FqeData object"""
         return copy.deepcopy(self.data)
@@ -52,19 +61,25 @@ class FqeDataLoader:
         return cr + 1.j * ci
 
     def get_harray(self, order):
+        key = ('h', order)
+        if key in self._cache:
+            return self._cache[key]
         filename = os.path.join(self.file_path,
                                 "h" + str(order) + self.nstr + ".npy")
         shape = tuple([self.norb] * order * 2)
-        return numpy.fromfile(filename).reshape(shape)
+        return self._store(key, numpy.fromfile(filename).reshape(shape))
 
     def get_href(self, hstr):
+        key = ('href', hstr)
+        if key in self._cache:
+            return self._cache[key]
         fr = os.path.join(self.file_path,
                           "cr" + self.nstr + "_" + hstr + ".npy")
         fi = os.path.join(self.file_path,
                           "ci" + self.nstr + "_" + hstr + ".npy")
         cr = numpy.fromfile(fr).reshape(self.data.coeff.shape)
         ci = numpy.fromfile(fi).reshape(self.data.coeff.shape)
-        return cr + 1.j * ci
+        return self._store(key, cr + 1.j * ci)
 
     def get_indv_ref(self, daga, undaga, dagb, undagb):
         nstr = self.nstr
@@ -83,6 +98,9 @@ class FqeDataLoader:
         return cr + 1.j * ci
 
     def get_rdm(self, order):
+        key = ('rdm', order)
+        if key in self._cache:
+            return self._cache[key]
         fr = os.path.join(self.file_path,
                           "dr" + str(order) + self.nstr + ".npy")
         fi = os.path.join(self.file_path,
@@ -90,4 +108,4 @@ class FqeDataLoader:
         shape = tuple([self.norb] * order * 2)
         dr = numpy.fromfile(fr).reshape(shape)
         di = numpy.fromfile(fi).reshape(shape)
-        return dr + 1.j * di
+        return self._store(key, dr + 1.j * di)